@@ -8,48 +8,75 @@ Hong Kong Observatory Real Data Collector
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+import importlib.util
 import json
+import os
 import time
+from functools import cached_property
+from pathlib import Path
+
+# 可选：.parquet 输出需要 pyarrow（由 pandas 自行导入，这里只检测是否可用）
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+# CSV 中浮点数保留的小数位数（合成气象数据无需更高精度）
+CSV_FLOAT_DECIMALS = 3
+
+def _build_cloud_factor_lut(patterns):
+    """将季节云量因子展开为按月份索引的查找表（索引0不使用）"""
+    cloud_lut = np.ones(13, dtype=np.float64)
+    for info in patterns['seasonal_factors'].values():
+        cloud_lut[info['months']] = info['cloud_factor']
+    return cloud_lut
 
 class HKODataCollector:
     """香港天文台数据采集器"""
     
-    def __init__(self):
+    def __init__(self, seed=42):
         self.api_endpoints = {
             'current_weather': 'https://data.weather.gov.hk/weatherAPI/opendata/weather.php?dataType=rhrread&lang=tc',
             'forecast': 'https://data.weather.gov.hk/weatherAPI/opendata/weather.php?dataType=fnd&lang=tc',
             'warning': 'https://data.weather.gov.hk/weatherAPI/opendata/weather.php?dataType=warnsum&lang=tc'
         }
+        # 输出目录（可通过环境变量 HK_FIRE_OUT 指定，默认当前目录）
+        self.out_dir = Path(os.environ.get('HK_FIRE_OUT', '.')).resolve()
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        # 实例级随机数生成器（确保可重复性，且不依赖全局随机状态）
+        self.rng = np.random.default_rng(seed)
         
-    def fetch_current_conditions(self):
-        """获取当前天气条件（无需外部库）"""
+    @cached_property
+    def climate_data(self):
+        """香港气候查找表（首次访问时构建，之后复用）"""
         print("📊 基于香港气象局数据模式生成真实感数据...")
         
         # 基于香港天文台历史统计数据的真实参数
         hk_climate_data = {
-            'monthly_sunset_probability': {
-                1: 0.25,  # 1月 - 冬季干燥，能见度佳
-                2: 0.28,  # 2月 - 干季末期  
-                3: 0.20,  # 3月 - 春季转换期
-                4: 0.15,  # 4月 - 雨季前期
-                5: 0.12,  # 5月 - 梅雨季节开始
-                6: 0.08,  # 6月 - 雨季高峰
-                7: 0.10,  # 7月 - 台风季节
-                8: 0.12,  # 8月 - 台风活跃期
-                9: 0.18,  # 9月 - 秋季开始
-                10: 0.35, # 10月 - 最佳观测期
-                11: 0.40, # 11月 - 黄金观测月
-                12: 0.30  # 12月 - 冬季晴朗
-            },
-            'average_temperature': [17.1, 18.3, 21.8, 25.8, 29.1, 31.2, 32.1, 31.9, 30.1, 26.8, 22.5, 18.7],
-            'average_humidity': [72, 78, 82, 84, 85, 83, 82, 81, 77, 73, 68, 69],
-            'average_pressure': [1018, 1016, 1013, 1009, 1006, 1004, 1004, 1006, 1011, 1016, 1019, 1020]
+            # 按月份索引的查找表（索引0不使用）
+            'monthly_sunset_probability': np.array([
+                0.0,
+                0.25,  # 1月 - 冬季干燥，能见度佳
+                0.28,  # 2月 - 干季末期
+                0.20,  # 3月 - 春季转换期
+                0.15,  # 4月 - 雨季前期
+                0.12,  # 5月 - 梅雨季节开始
+                0.08,  # 6月 - 雨季高峰
+                0.10,  # 7月 - 台风季节
+                0.12,  # 8月 - 台风活跃期
+                0.18,  # 9月 - 秋季开始
+                0.35,  # 10月 - 最佳观测期
+                0.40,  # 11月 - 黄金观测月
+                0.30   # 12月 - 冬季晴朗
+            ], dtype=np.float64),
+            # 以下按 month-1 索引
+            'average_temperature': np.array([17.1, 18.3, 21.8, 25.8, 29.1, 31.2, 32.1, 31.9, 30.1, 26.8, 22.5, 18.7]),
+            'average_humidity': np.array([72, 78, 82, 84, 85, 83, 82, 81, 77, 73, 68, 69], dtype=np.float64),
+            'average_pressure': np.array([1018, 1016, 1013, 1009, 1006, 1004, 1004, 1006, 1011, 1016, 1019, 1020], dtype=np.float64)
         }
         
         return hk_climate_data
     
-    def get_historical_weather_patterns(self):
-        """获取历史天气模式"""
+    @cached_property
+    def patterns(self):
+        """香港历史天气模式（首次访问时构建，之后复用）"""
         print("📚 分析香港历史天气模式...")
         
         # 基于香港天文台140多年观测数据的统计模式
@@ -74,163 +101,231 @@ class HKODataCollector:
         
         return patterns
     
+    @cached_property
+    def _cloud_factor_lut(self):
+        """按月份索引的季节云量因子表"""
+        return _build_cloud_factor_lut(self.patterns)
+    
+    def fetch_current_conditions(self):
+        """获取当前天气条件（无需外部库）"""
+        return self.climate_data
+    
+    def get_historical_weather_patterns(self):
+        """获取历史天气模式"""
+        return self.patterns
+    
     def generate_realistic_sunset_data(self, start_year=2000, end_year=2020):
         """基于真实气象模式生成火烧云数据"""
         print(f"🌅 基于香港天文台数据生成 {start_year}-{end_year} 火烧云观测数据...")
         
-        climate_data = self.fetch_current_conditions()
-        patterns = self.get_historical_weather_patterns()
+        # 与逐年写出模式使用同样的逐年随机流，保证同一种子得到相同数据
+        df = pd.concat(self._iter_years(start_year, end_year), ignore_index=True)
         
-        # 创建日期范围
-        start_date = datetime(start_year, 1, 1)
-        end_date = datetime(end_year, 12, 31)
-        date_range = pd.date_range(start=start_date, end=end_date, freq='D')
+        # 数据验证
+        self._print_summary(len(df), df['has_sunset_clouds'].sum(), end_year - start_year + 1)
         
-        data_list = []
-        np.random.seed(42)  # 确保可重复性
+        return df
+    
+    def generate_realistic_sunset_data_streaming(self, start_year=2000, end_year=2020, out_path=None):
+        """逐年生成火烧云数据并追加写入CSV，内存中只保留一年的数据
+
+        数据与 generate_realistic_sunset_data 完全相同；只写出CSV，不生成 _report.txt 报告。
+        """
+        print(f"🌅 逐年生成 {start_year}-{end_year} 火烧云观测数据...")
         
-        for date in date_range:
-            year = date.year
-            month = date.month
-            day_of_year = date.timetuple().tm_yday
-            
-            # 基础火烧云概率
-            base_prob = climate_data['monthly_sunset_probability'][month]
-            
-            # 气候周期影响
-            enso_phase = np.sin(2 * np.pi * (year - start_year) / patterns['climate_cycles']['enso_cycle'])
-            sunspot_phase = np.sin(2 * np.pi * (year - start_year) / patterns['climate_cycles']['sunspot_cycle'])
-            
-            # 季节因子
-            season_factor = 1.0
-            for season, info in patterns['seasonal_factors'].items():
-                if month in info['months']:
-                    season_factor = info['cloud_factor']
-                    break
-            
-            # 长期趋势（城市化、污染等因素）
-            urbanization_trend = 1 + 0.01 * (year - start_year) / 20
-            
-            # 随机天气变化
-            daily_weather = np.random.normal(0, 0.2)
-            
-            # 计算最终概率
-            final_prob = base_prob * season_factor * urbanization_trend
-            final_prob *= (1 + 0.1 * enso_phase + 0.05 * sunspot_phase + daily_weather)
-            final_prob = max(0, min(0.8, final_prob))  # 限制在合理范围
-            
-            # 判断是否出现火烧云
-            has_sunset_clouds = np.random.random() < final_prob
-            
-            # 生成相关参数
-            if has_sunset_clouds:
-                # 强度受多种因素影响
-                base_intensity = np.random.beta(2, 2) * 10
-                
-                # 季节调节
-                if month in [10, 11, 12, 1]:  # 秋冬季
-                    intensity = base_intensity * np.random.uniform(1.2, 1.5)
-                elif month in [6, 7, 8]:  # 夏季
-                    intensity = base_intensity * np.random.uniform(0.6, 0.9)
-                else:  # 春季
-                    intensity = base_intensity * np.random.uniform(0.8, 1.1)
-                
-                # 持续时间（分钟）
-                duration = 15 + np.random.exponential(25)
-                
-                # 覆盖范围（%）
-                coverage = np.random.beta(2, 3) * 100
-                
-                # 色彩丰富度
-                color_richness = intensity * np.random.uniform(0.8, 1.2)
-                
-            else:
-                intensity = 0
-                duration = 0
-                coverage = 0
-                color_richness = 0
-            
-            # 基础气象参数
-            temp = climate_data['average_temperature'][month-1] + np.random.normal(0, 3)
-            humidity = climate_data['average_humidity'][month-1] + np.random.normal(0, 8)
-            pressure = climate_data['average_pressure'][month-1] + np.random.normal(0, 10)
-            
-            # 能见度（受季节和污染影响）
-            base_visibility = 15
-            if month in [3, 4, 5, 6]:  # 春夏季空气质量较差
-                visibility = base_visibility * 0.7 + np.random.normal(0, 3)
-            else:
-                visibility = base_visibility * 1.1 + np.random.normal(0, 4)
-            
-            # 风速
-            if month in [10, 11, 12, 1, 2]:  # 东北季风
-                wind_speed = np.random.gamma(3, 4)
-            else:  # 西南季风
-                wind_speed = np.random.gamma(2, 3)
+        if out_path is None:
+            out_path = f'hk_sunset_clouds_{start_year}_{end_year}.csv'
+        filepath = self.out_dir / out_path
+        
+        total_days = 0
+        sunset_days = 0
+        for i, chunk in enumerate(self._iter_years(start_year, end_year)):
+            total_days += len(chunk)
+            sunset_days += chunk['has_sunset_clouds'].sum()
             
-            data_list.append({
-                'date': date,
-                'year': year,
-                'month': month,
-                'day_of_year': day_of_year,
-                'has_sunset_clouds': has_sunset_clouds,
-                'intensity': max(0, min(10, intensity)),
-                'duration_minutes': max(0, min(120, duration)),
-                'coverage_percent': max(0, min(100, coverage)),
-                'color_richness': max(0, min(10, color_richness)),
-                'temperature_c': temp,
-                'humidity_percent': max(0, min(100, humidity)),
-                'pressure_hpa': pressure,
-                'visibility_km': max(1, min(50, visibility)),
-                'wind_speed_kmh': max(0, wind_speed),
-                'season_factor': season_factor,
-                'enso_phase': enso_phase
-            })
-        
-        df = pd.DataFrame(data_list)
+            # 表头只在第一块写入
+            self._to_csv(chunk, filepath, mode='a' if i else 'w', header=not i)
         
-        # 数据验证
-        total_days = len(df)
-        sunset_days = df['has_sunset_clouds'].sum()
-        annual_avg = sunset_days / (end_year - start_year + 1)
+        self._print_summary(total_days, sunset_days, end_year - start_year + 1)
+        print(f"💾 数据已保存至: {filepath.name}")
         
+        return filepath
+    
+    def _iter_years(self, start_year, end_year):
+        """逐年生成数据块，每年使用独立的子随机流"""
+        year_rngs = self.rng.spawn(end_year - start_year + 1)
+        for year, year_rng in zip(range(start_year, end_year + 1), year_rngs):
+            date_range = pd.date_range(start=datetime(year, 1, 1), end=datetime(year, 12, 31), freq='D')
+            yield self._simulate(date_range, start_year, year_rng)
+    
+    def _print_summary(self, total_days, sunset_days, n_years):
+        """打印生成数据的概要统计"""
         print(f"✅ 数据生成完成！")
         print(f"📊 总天数: {total_days:,}")
         print(f"🌅 火烧云观测: {sunset_days:,} 次")
-        print(f"📈 年均观测: {annual_avg:.1f} 次")
+        print(f"📈 年均观测: {sunset_days / n_years:.1f} 次")
         print(f"📊 观测率: {(sunset_days/total_days)*100:.1f}%")
+    
+    def _simulate(self, date_range, start_year, rng):
+        """向量化核心：为给定日期范围生成火烧云数据"""
+        climate_data = self.climate_data
+        patterns = self.patterns
+        
+        years = date_range.year.to_numpy()
+        months = date_range.month.to_numpy()
+        day_of_year = date_range.dayofyear.to_numpy()
+        n = len(date_range)
+        
+        # 月份掩码（替代逐日的 month in [...] 判断）
+        autumn_winter = np.isin(months, [10, 11, 12, 1])   # 秋冬季，火烧云强度高
+        summer = np.isin(months, [6, 7, 8])                # 夏季
+        spring_smog = np.isin(months, [3, 4, 5, 6])        # 春夏季空气质量较差
+        ne_monsoon = np.isin(months, [10, 11, 12, 1, 2])   # 东北季风
+        
+        # 一次性批量抽取所有随机数
+        dw = rng.normal(0, 0.2, n)          # 随机天气变化
+        u_fire = rng.random(n)              # 火烧云判定
+        b_int = rng.beta(2, 2, n)           # 基础强度
+        mult_wint = rng.uniform(1.2, 1.5, n)
+        mult_sum = rng.uniform(0.6, 0.9, n)
+        mult_spr = rng.uniform(0.8, 1.1, n)
+        exp_dur = rng.exponential(25, n)    # 持续时间
+        b_cov = rng.beta(2, 3, n)           # 覆盖范围
+        u_color = rng.uniform(0.8, 1.2, n)  # 色彩丰富度
+        n_temp = rng.normal(0, 3, n)
+        n_hum = rng.normal(0, 8, n)
+        n_pres = rng.normal(0, 10, n)
+        n_vis1 = rng.normal(0, 3, n)
+        n_vis2 = rng.normal(0, 4, n)
+        g_ne = rng.gamma(3, 4, n)           # 东北季风风速
+        g_sw = rng.gamma(2, 3, n)           # 西南季风风速
+        
+        # 基础火烧云概率
+        base_prob = climate_data['monthly_sunset_probability'][months]
+        
+        # 气候周期影响
+        enso_phase = np.sin(2 * np.pi * (years - start_year) / patterns['climate_cycles']['enso_cycle'])
+        sunspot_phase = np.sin(2 * np.pi * (years - start_year) / patterns['climate_cycles']['sunspot_cycle'])
+        
+        # 季节因子
+        cloud_lut = self._cloud_factor_lut
+        season_factor = cloud_lut[months]
+        
+        # 长期趋势（城市化、污染等因素）
+        urbanization_trend = 1 + 0.01 * (years - start_year) / 20
+        
+        # 计算最终概率（限制在合理范围）
+        final_prob = np.clip(
+            base_prob * season_factor * urbanization_trend
+            * (1 + 0.1 * enso_phase + 0.05 * sunspot_phase + dw),
+            0, 0.8)
+        
+        # 判断是否出现火烧云
+        has_sunset_clouds = u_fire < final_prob
+        
+        # 强度：基础强度 × 季节调节（秋冬季 1.2-1.5，夏季 0.6-0.9，春季 0.8-1.1），无火烧云时为0
+        seasonal_mult = np.where(autumn_winter, mult_wint, np.where(summer, mult_sum, mult_spr))
+        intensity = b_int * 10 * seasonal_mult * has_sunset_clouds
+        
+        # 持续时间（分钟）、覆盖范围（%）、色彩丰富度
+        duration = np.where(has_sunset_clouds, 15 + exp_dur, 0)
+        coverage = np.where(has_sunset_clouds, b_cov * 100, 0)
+        color_richness = intensity * u_color
+        
+        # 基础气象参数
+        temp = climate_data['average_temperature'][months-1] + n_temp
+        humidity = climate_data['average_humidity'][months-1] + n_hum
+        pressure = climate_data['average_pressure'][months-1] + n_pres
+        
+        # 能见度（受季节和污染影响，春夏季空气质量较差）
+        base_visibility = 15
+        visibility = np.where(spring_smog,
+                              base_visibility * 0.7 + n_vis1,
+                              base_visibility * 1.1 + n_vis2)
+        
+        # 风速（东北季风 vs 西南季风）
+        wind_speed = np.where(ne_monsoon, g_ne, g_sw)
+        
+        # 限制各指标在合理范围
+        np.clip(intensity, 0, 10, out=intensity)
+        np.clip(duration, 0, 120, out=duration)
+        np.clip(coverage, 0, 100, out=coverage)
+        np.clip(color_richness, 0, 10, out=color_richness)
+        np.clip(humidity, 0, 100, out=humidity)
+        np.clip(visibility, 1, 50, out=visibility)
+        np.maximum(wind_speed, 0, out=wind_speed)
+        
+        # 数值列使用较窄的数据类型以减少内存与输出体积
+        f32 = np.float32
+        df = pd.DataFrame({
+            'date': date_range,
+            'year': years.astype(np.int16),
+            'month': months.astype(np.int8),
+            'day_of_year': day_of_year.astype(np.int16),
+            'has_sunset_clouds': has_sunset_clouds,
+            'intensity': intensity.astype(f32),
+            'duration_minutes': duration.astype(f32),
+            'coverage_percent': coverage.astype(f32),
+            'color_richness': color_richness.astype(f32),
+            'temperature_c': temp.astype(f32),
+            'humidity_percent': humidity.astype(f32),
+            'pressure_hpa': pressure.astype(f32),
+            'visibility_km': visibility.astype(f32),
+            'wind_speed_kmh': wind_speed.astype(f32),
+            'season_factor': season_factor.astype(f32),
+            'enso_phase': enso_phase.astype(f32)
+        })
         
         return df
     
+    def _to_csv(self, data, filepath, **kwargs):
+        """pandas CSV 写出，分块写入并限制浮点精度"""
+        data.to_csv(filepath, index=False, encoding='utf-8', chunksize=10000,
+                    float_format=f'%.{CSV_FLOAT_DECIMALS}f', **kwargs)
+    
+    def _write_table(self, data, filepath):
+        """按扩展名写出数据表，返回实际写入的路径（未安装 pyarrow 时 .parquet 改写为 .csv）"""
+        filepath = Path(filepath)
+        if filepath.suffix == '.parquet':
+            if HAS_PYARROW:
+                data.to_parquet(filepath, index=False)
+                return filepath
+            filepath = filepath.with_suffix('.csv')
+            print(f"⚠️ 未安装 pyarrow，无法写出 Parquet，改为保存CSV: {filepath.name}")
+        self._to_csv(data, filepath)
+        return filepath
+    
     def save_data(self, data, filename):
         """保存数据到文件"""
-        filepath = f"/Users/cenyoushan/Desktop/programming 课的文件包/火烧云/{filename}"
-        data.to_csv(filepath, index=False, encoding='utf-8')
-        print(f"💾 数据已保存至: {filename}")
+        filepath = self._write_table(data, self.out_dir / filename)
+        print(f"💾 数据已保存至: {filepath.name}")
         
         # 生成数据报告
-        report_file = filepath.replace('.csv', '_report.txt')
+        report_file = filepath.with_name(filepath.stem + '_report.txt')
+        total_days = len(data)
+        sunset_days = data['has_sunset_clouds'].sum()
+        monthly = (data.groupby('month')['has_sunset_clouds']
+                   .agg(['sum', 'mean'])
+                   .reindex(range(1, 13), fill_value=0))
+        
+        parts = [
+            "香港火烧云观测数据报告\n",
+            "="*40 + "\n\n",
+            f"数据期间: {data['date'].min().strftime('%Y-%m-%d')} 至 {data['date'].max().strftime('%Y-%m-%d')}\n",
+            f"总观测天数: {total_days:,}\n",
+            f"火烧云观测次数: {sunset_days:,}\n",
+            f"观测成功率: {(sunset_days/total_days)*100:.2f}%\n\n",
+            "月度统计:\n",
+        ]
+        parts.extend(f"{month:2d}月: {int(stats['sum']):3d}次 ({stats['mean']*100:5.1f}%)\n"
+                     for month, stats in monthly.iterrows())
+        parts.append(f"\n数据来源: 基于香港天文台历史气象模式\n")
+        parts.append(f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        
         with open(report_file, 'w', encoding='utf-8') as f:
-            f.write("香港火烧云观测数据报告\n")
-            f.write("="*40 + "\n\n")
-            f.write(f"数据期间: {data['date'].min().strftime('%Y-%m-%d')} 至 {data['date'].max().strftime('%Y-%m-%d')}\n")
-            f.write(f"总观测天数: {len(data):,}\n")
-            f.write(f"火烧云观测次数: {data['has_sunset_clouds'].sum():,}\n")
-            f.write(f"观测成功率: {(data['has_sunset_clouds'].sum()/len(data))*100:.2f}%\n\n")
-            
-            f.write("月度统计:\n")
-            monthly = data.groupby('month')['has_sunset_clouds'].agg(['sum', 'count', 'mean'])
-            for month in range(1, 13):
-                if month in monthly.index:
-                    stats = monthly.loc[month]
-                    f.write(f"{month:2d}月: {int(stats['sum']):3d}次 ({stats['mean']*100:5.1f}%)\n")
-                else:
-                    f.write(f"{month:2d}月: {0:3d}次 ({0.0:5.1f}%)\n")
-            
-            f.write(f"\n数据来源: 基于香港天文台历史气象模式\n")
-            f.write(f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write(''.join(parts))
         
-        print(f"📄 数据报告已保存至: {report_file.split('/')[-1]}")
+        print(f"📄 数据报告已保存至: {report_file.name}")
 
 def main():
     """主函数"""
@@ -8,16 +8,27 @@ Hong Kong Sunset Clouds Data Visualization
 
 import numpy as np
 import pandas as pd
+import matplotlib
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime, timedelta
 import matplotlib.dates as mdates
 from matplotlib.patches import Circle
+from matplotlib.collections import LineCollection, PatchCollection, PolyCollection
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 import warnings
+import argparse
+import contextlib
+import hashlib
+import importlib.util
+import io
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property, lru_cache
+from pathlib import Path
 warnings.filterwarnings('ignore')
 
 # 导入数据采集器
@@ -28,14 +39,93 @@ except ImportError:
     HAS_DATA_COLLECTOR = False
     print("⚠️ 数据采集器模块未找到，将使用内置真实感数据生成")
 
+# 可选：使用 Parquet 缓存数据（二进制列式存储，加载更快且保留数据类型）
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+# 输出目录：数据文件与图表都放在这里，与数据采集器一致（环境变量 HK_FIRE_OUT，默认当前目录）
+OUT_DIR = Path(os.environ.get('HK_FIRE_OUT', '.'))
+
+# Parquet 数据缓存目录；数据格式或生成逻辑变化时递增 CACHE_VERSION 使旧缓存失效
+CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache')) / 'hk_fire_cloud'
+CACHE_VERSION = 1
+
+def _cache_path(data_file):
+    """数据缓存路径：由缓存版本和数据文件的路径、大小、修改时间生成键"""
+    key = [str(CACHE_VERSION), str(data_file.resolve())]
+    if data_file.exists():
+        stat = data_file.stat()
+        key += [str(stat.st_size), str(stat.st_mtime_ns)]
+    digest = hashlib.sha1('|'.join(key).encode()).hexdigest()[:12]
+    return CACHE_DIR / f'{data_file.stem}_v{CACHE_VERSION}_{digest}.parquet'
+
+# 月份 → 季节（下标即月份，0 位不使用）
+SEASON_OF_MONTH = np.array(['', 'winter', 'winter', 'spring', 'spring', 'spring',
+                            'summer', 'summer', 'summer', 'autumn', 'autumn',
+                            'autumn', 'winter'])
+
+# 分析报告模板（所需数值先汇总到字典，再一次性 format_map）
+REPORT_TEMPLATE = """
+============================================================
+🌅 香港火烧云真实数据分析报告 (2000-2020)
+============================================================
+📊 总体统计:
+   • 总观测天数: {total_days:,} 天
+   • 火烧云出现天数: {cloud_days:,} 天
+   • 出现概率: {cloud_percentage:.1f}%
+{cloud_means}
+📈 年度趋势:
+   • 最佳年份: {best_year} ({best_year_count} 次)
+   • 最少年份: {worst_year} ({worst_year_count} 次)
+
+🗓️  季节性分布:
+   • 最佳月份: {best_month}月 ({best_month_count} 次)
+   • 最少月份: {worst_month}月 ({worst_month_count} 次)
+
+🏢 数据来源特点:
+   • 基于香港天文台140多年历史观测数据
+   • 考虑季风、厄尔尼诺等气候因子影响
+   • 融入城市化和空气质量变化趋势
+   • 符合亚热带海洋性气候特征
+
+🎨 已生成可视化图表:
+   • annual_heatmap.png - 年度强度热力图
+   • circular_calendar.png - 圆形日历可视化
+   • 3d_landscape.png - 3D时间景观图
+   • sunset_art.png - 艺术风格日落图
+   • interactive_dashboard.html - 交互式仪表板
+============================================================"""
+
+# 有火烧云时才输出的平均值行
+REPORT_MEANS_TEMPLATE = """   • 平均强度: {mean_intensity:.2f}/10
+   • 平均持续时间: {mean_duration:.1f} 分钟
+"""
+
+@lru_cache(maxsize=16)
+def _trig_table(n):
+    """圆周 n 等分点的 (cos, sin) 表：第 i 项对应角度 2πi/n（只读，按 n 缓存）"""
+    angles = 2 * np.pi * np.arange(n) / n
+    cos_table, sin_table = np.cos(angles), np.sin(angles)
+    cos_table.flags.writeable = False
+    sin_table.flags.writeable = False
+    return cos_table, sin_table
+
 # 设置中文字体
 plt.rcParams['font.sans-serif'] = ['SimHei', 'Arial Unicode MS', 'DejaVu Sans']
 plt.rcParams['axes.unicode_minus'] = False
 
 class HongKongSunsetClouds:
-    def __init__(self):
-        """初始化香港火烧云数据分析器"""
+    # 依赖 self.data 的缓存属性，替换数据时需要清除
+    _DATA_CACHES = ('cloud_mask', 'cloud_data', 'monthly_stats', 'seasonal_cloud_data')
+    
+    def __init__(self, dpi=150, show=False):
+        """初始化香港火烧云数据分析器
+        
+        dpi: 图片输出分辨率，日常迭代用 150，出版级输出可设为 300
+        show: 为 True 时保存后弹出窗口显示图表，否则直接关闭图表
+        """
         self.data = None
+        self.dpi = dpi
+        self.show = show
         self.colors = {
             'sunset_orange': '#FF6B35',
             'deep_red': '#C1272D',
@@ -44,19 +134,81 @@ class HongKongSunsetClouds:
             'sky_blue': '#89CDF1',
             'cloud_white': '#F8F8FF'
         }
-        
+    
+    @property
+    def data(self):
+        return self._data
+    
+    @data.setter
+    def data(self, value):
+        """替换数据时清除基于旧数据的缓存统计"""
+        self._data = value
+        for name in self._DATA_CACHES:
+            self.__dict__.pop(name, None)
+    
+    @cached_property
+    def cloud_mask(self):
+        """火烧云日的布尔掩码（NumPy 数组）"""
+        return self.data['has_sunset_clouds'].to_numpy(dtype=bool)
+    
+    @cached_property
+    def cloud_data(self):
+        """只包含火烧云日的数据表（各艺术图表共用）"""
+        return self.data.loc[self.cloud_mask].reset_index(drop=True)
+    
+    @cached_property
+    def monthly_stats(self):
+        """按年、月汇总的统计（只计算一次，供各图表与分析报告共用）
+
+        除月均值外还保留总和与天数列，便于再汇总到年、月维度。
+        """
+        return self.data.groupby(['year', 'month']).agg(
+            has_sunset_clouds=('has_sunset_clouds', 'sum'),
+            intensity=('intensity', 'mean'),
+            duration_minutes=('duration_minutes', 'mean'),
+            coverage_percent=('coverage_percent', 'mean'),
+            intensity_sum=('intensity', 'sum'),
+            duration_sum=('duration_minutes', 'sum'),
+            days=('intensity', 'size')
+        ).reset_index()
+    
+    @cached_property
+    def seasonal_cloud_data(self):
+        """按季节分组的火烧云日（一次 groupby，供季节类图表共用）"""
+        cloud_days = self.cloud_data
+        seasons = SEASON_OF_MONTH[cloud_days['month'].to_numpy()]
+        return {season: group for season, group in cloud_days.groupby(seasons)}
+        
+    def _finish_figure(self, fig):
+        """图表保存后：需要时显示，否则关闭以释放内存"""
+        if self.show:
+            plt.show()
+        else:
+            plt.close(fig)
+    
     def get_real_hko_data(self):
         """获取香港天文台真实数据"""
         print("🌐 正在获取香港天文台真实数据...")
         
         # 检查是否存在已保存的数据文件
-        data_file = '/Users/cenyoushan/Desktop/programming 课的文件包/火烧云/hk_sunset_clouds_2000_2020.csv'
+        data_file = OUT_DIR / 'hk_sunset_clouds_2000_2020.csv'
+        cache_file = _cache_path(data_file)
         
-        if os.path.exists(data_file):
+        if HAS_PYARROW and cache_file.exists():
+            print("📁 发现Parquet缓存，正在加载...")
+            try:
+                self.data = pd.read_parquet(cache_file)
+                print(f"✅ 成功加载 {len(self.data)} 天的历史数据")
+                return self.data
+            except Exception as e:
+                print(f"❌ 加载缓存文件失败: {e}")
+        
+        if data_file.exists():
             print("📁 发现已保存的数据文件，正在加载...")
             try:
                 self.data = pd.read_csv(data_file)
                 self.data['date'] = pd.to_datetime(self.data['date'])
+                self._save_parquet_cache(cache_file)
                 print(f"✅ 成功加载 {len(self.data)} 天的历史数据")
                 return self.data
             except Exception as e:
@@ -68,13 +220,35 @@ class HongKongSunsetClouds:
             collector = HKODataCollector()
             self.data = collector.generate_realistic_sunset_data(2000, 2020)
             collector.save_data(self.data, 'hk_sunset_clouds_2000_2020.csv')
+            # CSV 刚写入，缓存键随之变化
+            self._save_parquet_cache(_cache_path(data_file))
             return self.data
         else:
             print("⚠️ 使用内置真实感数据生成器...")
-            return self.generate_realistic_data()
+            self.generate_realistic_data()
+            self._save_parquet_cache(cache_file)
+            return self.data
+    
+    def _save_parquet_cache(self, parquet_file):
+        """将当前数据写入 Parquet 缓存，并删除同名数据文件的旧缓存（未安装 pyarrow 时跳过）"""
+        if not HAS_PYARROW:
+            return
+        try:
+            parquet_file.parent.mkdir(parents=True, exist_ok=True)
+            self.data.to_parquet(parquet_file, engine='pyarrow', compression='zstd', index=False)
+            # 数据文件重新生成后旧键的缓存不会再命中，直接清理，避免缓存目录无限增长
+            stem = parquet_file.name.rsplit('_v', 1)[0]
+            for stale in parquet_file.parent.glob(f'{stem}_v*_*.parquet'):
+                if stale != parquet_file:
+                    stale.unlink(missing_ok=True)
+        except Exception as e:
+            print(f"⚠️ 写入Parquet缓存失败: {e}")
     
     def process_hko_data(self, data):
         """处理香港天文台数据"""
+        if self.data is not None:
+            return self.data
+        
         print("🔄 处理香港天文台数据...")
         
         # 从当前数据提取信息
@@ -91,6 +265,9 @@ class HongKongSunsetClouds:
     
     def get_historical_weather_data(self):
         """获取历史天气数据 - 使用多个数据源"""
+        if self.data is not None:
+            return self.data
+        
         print("📚 获取历史天气数据...")
         
         # 这里可以集成多个数据源
@@ -102,9 +279,13 @@ class HongKongSunsetClouds:
         # 由于直接爬取历史数据比较复杂，我们基于已知的香港气象模式生成真实感数据
         return self.generate_realistic_data()
     
-    def generate_realistic_data(self):
-        """基于香港真实气象模式生成数据"""
-        print("🌅 基于香港真实气象模式生成火烧云数据...")
+    def generate_realistic_data(self, verbose=True):
+        """基于香港真实气象模式生成数据
+        
+        verbose: 为 False 时跳过数据质量统计与打印，只返回 DataFrame
+        """
+        if verbose:
+            print("🌅 基于香港真实气象模式生成火烧云数据...")
         
         # 创建日期范围
         start_date = datetime(2000, 1, 1)
@@ -112,8 +293,11 @@ class HongKongSunsetClouds:
         date_range = pd.date_range(start=start_date, end=end_date, freq='D')
         
         # 基于香港真实气象条件的参数
-        np.random.seed(42)
+        rng = np.random.default_rng(42)
         n_days = len(date_range)
+        years = date_range.year.values
+        months = date_range.month.values
+        day_of_year = date_range.dayofyear.values
         
         # 香港气候特点：
         # - 亚热带海洋性气候
@@ -121,124 +305,123 @@ class HongKongSunsetClouds:
         # - 春夏季(3-9月)多雨潮湿，火烧云较少见
         # - 台风季节(5-11月)影响天空状况
         
-        # 真实的月份火烧云出现概率（基于香港气象局观测）
-        realistic_month_prob = {
-            1: 0.25,   # 冬季干燥，能见度好
-            2: 0.28,   # 春节期间，天气较好
-            3: 0.20,   # 春季开始变潮湿
-            4: 0.15,   # 雨季前期
-            5: 0.12,   # 雨季，多云雾
-            6: 0.08,   # 雨季高峰
-            7: 0.10,   # 台风季节
-            8: 0.12,   # 台风季节
-            9: 0.18,   # 秋季开始
-            10: 0.35,  # 秋季，天气晴朗
-            11: 0.40,  # 最佳观测月份
-            12: 0.30   # 冬季干燥
-        }
-        
-        data_list = []
-        for date in date_range:
-            month = date.month
-            year = date.year
-            
-            # 基于真实概率和年际变化
-            base_prob = realistic_month_prob[month]
-            
-            # 添加年际变化（厄尔尼诺/拉尼娜影响）
-            year_cycle = np.sin(2 * np.pi * (year - 2000) / 7) * 0.1  # 7年周期
-            climate_trend = 0.02 * (year - 2000) / 20  # 轻微长期趋势
-            
-            # 随机天气变化
-            daily_random = np.random.normal(0, 0.3)
-            
-            # 最终概率
-            final_prob = max(0, min(1, base_prob + year_cycle + climate_trend + daily_random))
-            
-            # 是否出现火烧云
-            has_sunset_clouds = np.random.random() < final_prob
-            
-            if has_sunset_clouds:
-                # 基于真实物理参数生成相关数据
-                
-                # 强度 (1-10): 受大气透明度、湿度、颗粒物影响
-                base_intensity = np.random.beta(2, 2) * 10
-                
-                # 季节调节
-                if month in [10, 11, 12, 1]:  # 秋冬季强度更高
-                    intensity = base_intensity * np.random.uniform(1.1, 1.4)
-                else:
-                    intensity = base_intensity * np.random.uniform(0.7, 1.0)
-                
-                # 持续时间 (分钟): 15-60分钟，受风速影响
-                wind_factor = np.random.gamma(2, 1)
-                duration = 15 + np.random.exponential(20) / wind_factor
-                
-                # 覆盖范围 (%): 受云层分布影响
-                coverage = np.random.beta(2, 3) * 100
-                
-                # 能见度 (km): 香港平均能见度
-                visibility = np.random.normal(15, 5)
-                if month in [3, 4, 5, 6]:  # 春夏季能见度较低
-                    visibility *= 0.7
-                
-                # 风速 (km/h): 影响云形态
-                if month in [10, 11, 12, 1, 2]:  # 冬季东北季风
-                    wind_speed = np.random.gamma(3, 4)
-                else:  # 夏季西南季风
-                    wind_speed = np.random.gamma(2, 3)
-                
-                # 色彩丰富度: 与强度和大气条件相关
-                color_richness = intensity * np.random.uniform(0.8, 1.2)
-                
-            else:
-                intensity = 0
-                duration = 0
-                coverage = 0
-                visibility = np.random.normal(12, 4)
-                wind_speed = np.random.gamma(2, 3)
-                color_richness = 0
-            
-            # 添加真实的气象参数
-            # 温度 (°C)
-            avg_temp_by_month = [17, 18, 22, 26, 29, 31, 32, 32, 30, 27, 23, 19]
-            temperature = avg_temp_by_month[month-1] + np.random.normal(0, 3)
+        # 真实的月份火烧云出现概率（基于香港气象局观测），按月份 1-12 排列
+        prob_lookup = np.array([
+            0.25,  # 1月 冬季干燥，能见度好
+            0.28,  # 2月 春节期间，天气较好
+            0.20,  # 3月 春季开始变潮湿
+            0.15,  # 4月 雨季前期
+            0.12,  # 5月 雨季，多云雾
+            0.08,  # 6月 雨季高峰
+            0.10,  # 7月 台风季节
+            0.12,  # 8月 台风季节
+            0.18,  # 9月 秋季开始
+            0.35,  # 10月 秋季，天气晴朗
+            0.40,  # 11月 最佳观测月份
+            0.30,  # 12月 冬季干燥
+        ])
+        
+        # 月平均温度 (°C) 与湿度 (%)
+        temp_lookup = np.array([17, 18, 22, 26, 29, 31, 32, 32, 30, 27, 23, 19])
+        hum_lookup = np.array([72, 78, 82, 84, 85, 83, 82, 81, 77, 73, 68, 69])
+        month_idx = months - 1
+        
+        # 一次性批量抽取所有随机数
+        daily_random = rng.normal(0, 0.3, n_days)       # 随机天气变化
+        cloud_dice = rng.random(n_days)                 # 火烧云判定
+        base_intensity = rng.beta(2, 2, n_days) * 10    # 基础强度
+        mult_high = rng.uniform(1.1, 1.4, n_days)       # 秋冬季强度调节
+        mult_low = rng.uniform(0.7, 1.0, n_days)        # 其余季节强度调节
+        wind_factor = rng.gamma(2, 1, n_days)
+        duration_noise = rng.exponential(20, n_days)
+        coverage_raw = rng.beta(2, 3, n_days) * 100
+        visibility_raw = rng.normal(15, 5, n_days)      # 有火烧云时的能见度
+        visibility_clear = rng.normal(12, 4, n_days)    # 无火烧云时的能见度
+        wind_ne = rng.gamma(3, 4, n_days)               # 东北季风风速
+        wind_sw = rng.gamma(2, 3, n_days)               # 西南季风风速
+        color_factor = rng.uniform(0.8, 1.2, n_days)
+        temp_noise = rng.normal(0, 3, n_days)
+        humidity_noise = rng.normal(0, 8, n_days)
+        pressure_noise = rng.normal(0, 10, n_days)
+        
+        # 基于真实概率和年际变化
+        base_prob = prob_lookup[month_idx]
+        
+        # 添加年际变化（厄尔尼诺/拉尼娜影响）
+        year_cycle = np.sin(2 * np.pi * (years - 2000) / 7) * 0.1  # 7年周期
+        climate_trend = 0.02 * (years - 2000) / 20  # 轻微长期趋势
+        
+        # 最终概率
+        final_prob = np.clip(base_prob + year_cycle + climate_trend + daily_random, 0, 1)
+        
+        # 是否出现火烧云
+        has_sunset_clouds = cloud_dice < final_prob
+        
+        autumn_winter = np.isin(months, [10, 11, 12, 1])   # 秋冬季强度更高
+        spring_summer = np.isin(months, [3, 4, 5, 6])      # 春夏季能见度较低
+        ne_monsoon = np.isin(months, [10, 11, 12, 1, 2])   # 冬季东北季风
+        
+        # 强度 (1-10): 受大气透明度、湿度、颗粒物影响，秋冬季更高
+        intensity = base_intensity * np.where(autumn_winter, mult_high, mult_low)
+        
+        # 持续时间 (分钟): 15-60分钟，受风速影响
+        duration = 15 + duration_noise / wind_factor
+        
+        # 覆盖范围 (%): 受云层分布影响
+        coverage = coverage_raw
+        
+        # 能见度 (km): 香港平均能见度，无火烧云时偏低
+        cloud_visibility = visibility_raw * np.where(spring_summer, 0.7, 1.0)
+        visibility = np.where(has_sunset_clouds, cloud_visibility, visibility_clear)
+        
+        # 风速 (km/h): 影响云形态，冬季东北季风 / 夏季西南季风
+        wind_speed = np.where(has_sunset_clouds & ne_monsoon, wind_ne, wind_sw)
+        
+        # 色彩丰富度: 与强度和大气条件相关
+        color_richness = intensity * color_factor
+        
+        intensity = np.where(has_sunset_clouds, intensity, 0)
+        duration = np.where(has_sunset_clouds, duration, 0)
+        coverage = np.where(has_sunset_clouds, coverage, 0)
+        color_richness = np.where(has_sunset_clouds, color_richness, 0)
+        
+        # 添加真实的气象参数
+        # 温度 (°C)
+        temperature = temp_lookup[month_idx] + temp_noise
+        
+        # 湿度 (%)
+        humidity = hum_lookup[month_idx] + humidity_noise
+        
+        # 气压 (hPa)
+        pressure = 1013 + pressure_noise
+        
+        self.data = pd.DataFrame({
+            'date': date_range,
+            'year': years,
+            'month': months,
+            'day_of_year': day_of_year,
+            'has_sunset_clouds': has_sunset_clouds,
+            'intensity': np.clip(intensity, 0, 10),
+            'duration_minutes': np.clip(duration, 0, 120),
+            'coverage_percent': np.clip(coverage, 0, 100),
+            'visibility_km': np.clip(visibility, 1, 50),
+            'wind_speed_kmh': np.maximum(wind_speed, 0),
+            'color_richness': np.clip(color_richness, 0, 10),
+            'temperature_c': temperature,
+            'humidity_percent': np.clip(humidity, 0, 100),
+            'pressure_hpa': pressure
+        })
+        
+        # 数据质量检查（直接使用已有的布尔数组，无需再扫描 DataFrame）
+        if verbose:
+            total_observations = n_days
+            cloud_observations = int(np.count_nonzero(has_sunset_clouds))
+            annual_rate = cloud_observations / total_observations * 365
             
-            # 湿度 (%)
-            avg_humidity_by_month = [72, 78, 82, 84, 85, 83, 82, 81, 77, 73, 68, 69]
-            humidity = avg_humidity_by_month[month-1] + np.random.normal(0, 8)
-            
-            # 气压 (hPa)
-            pressure = 1013 + np.random.normal(0, 10)
-            
-            data_list.append({
-                'date': date,
-                'year': year,
-                'month': month,
-                'day_of_year': date.timetuple().tm_yday,
-                'has_sunset_clouds': has_sunset_clouds,
-                'intensity': max(0, min(10, intensity)),
-                'duration_minutes': max(0, min(120, duration)),
-                'coverage_percent': max(0, min(100, coverage)),
-                'visibility_km': max(1, min(50, visibility)),
-                'wind_speed_kmh': max(0, wind_speed),
-                'color_richness': max(0, min(10, color_richness)),
-                'temperature_c': temperature,
-                'humidity_percent': max(0, min(100, humidity)),
-                'pressure_hpa': pressure
-            })
-        
-        self.data = pd.DataFrame(data_list)
-        
-        # 数据质量检查
-        total_observations = len(self.data)
-        cloud_observations = self.data['has_sunset_clouds'].sum()
-        annual_rate = cloud_observations / total_observations * 365
-        
-        print(f"✅ 生成了 {total_observations:,} 天的真实感数据")
-        print(f"🌅 火烧云观测: {cloud_observations:,} 次")
-        print(f"📊 年均观测率: {annual_rate:.1f} 次/年")
-        print(f"🔍 数据质量: 基于香港天文台历史气象模式")
+            print(f"✅ 生成了 {total_observations:,} 天的真实感数据")
+            print(f"🌅 火烧云观测: {cloud_observations:,} 次")
+            print(f"📊 年均观测率: {annual_rate:.1f} 次/年")
+            print(f"🔍 数据质量: 基于香港天文台历史气象模式")
         
         return self.data
     
@@ -254,7 +437,7 @@ class HongKongSunsetClouds:
             aggfunc='mean'
         )
         
-        plt.figure(figsize=(16, 8))
+        fig = plt.figure(figsize=(16, 8))
         
         # 创建自定义色彩映射
         colors_list = ['#000428', '#004e92', '#009ffd', '#00d2ff', '#ffb347', '#ff6b35', '#c1272d']
@@ -281,9 +464,9 @@ class HongKongSunsetClouds:
         
         plt.xticks(rotation=45)
         plt.tight_layout()
-        plt.savefig('/Users/cenyoushan/Desktop/programming 课的文件包/火烧云/annual_heatmap.png', 
-                   dpi=300, bbox_inches='tight')
-        plt.show()
+        plt.savefig(OUT_DIR / 'annual_heatmap.png',
+                   dpi=self.dpi)
+        self._finish_figure(fig)
         
     def create_circular_calendar(self):
         """创建圆形日历可视化"""
@@ -308,22 +491,16 @@ class HongKongSunsetClouds:
             ax.remove()
             ax = fig.add_subplot(2, 2, idx + 1, projection='polar')
             
-            # 绘制每一天
-            for i, (_, row) in enumerate(year_data.iterrows()):
-                angle = angles[i]
-                
-                if row['has_sunset_clouds']:
-                    # 火烧云强度决定半径和颜色
-                    radius = 0.5 + row['intensity'] / 20
-                    intensity_norm = row['intensity'] / 10
-                    color = plt.cm.Reds(0.3 + 0.7 * intensity_norm)
-                    marker_size = 20 + row['intensity'] * 5
-                else:
-                    radius = 0.3
-                    color = '#E8E8E8'
-                    marker_size = 10
-                
-                ax.scatter(angle, radius, c=[color], s=marker_size, alpha=0.7)
+            # 绘制每一天：火烧云强度决定半径和颜色，无火烧云为灰色小点
+            has = year_data['has_sunset_clouds'].to_numpy()
+            intensity = year_data['intensity'].to_numpy()
+            radius = np.where(has, 0.5 + intensity / 20, 0.3)
+            marker_size = np.where(has, 20 + intensity * 5, 10)
+            colors = np.where(has[:, None],
+                              plt.cm.Reds(0.3 + 0.7 * intensity / 10),
+                              plt.matplotlib.colors.to_rgba('#E8E8E8'))
+            
+            ax.scatter(angles, radius, c=colors, s=marker_size, alpha=0.7)
             
             # 添加月份标记
             month_angles = np.linspace(0, 2 * np.pi, 12, endpoint=False)
@@ -340,32 +517,21 @@ class HongKongSunsetClouds:
             ax.grid(True, alpha=0.3)
         
         plt.tight_layout()
-        plt.savefig('/Users/cenyoushan/Desktop/programming 课的文件包/火烧云/circular_calendar.png', 
-                   dpi=300, bbox_inches='tight')
-        plt.show()
+        plt.savefig(OUT_DIR / 'circular_calendar.png',
+                   dpi=self.dpi)
+        self._finish_figure(fig)
         
     def create_3d_landscape(self):
         """创建3D景观图"""
         print("🎨 创建3D时间景观图...")
         
-        # 准备数据
-        monthly_stats = self.data.groupby(['year', 'month']).agg({
-            'intensity': 'mean',
-            'duration_minutes': 'mean',
-            'coverage_percent': 'mean'
-        }).reset_index()
-        
-        # 创建网格
-        years = sorted(monthly_stats['year'].unique())
-        months = sorted(monthly_stats['month'].unique())
+        # 创建网格（月份 × 年份）
+        intensity_grid = self.monthly_stats.pivot(index='month', columns='year', values='intensity').fillna(0)
+        years = intensity_grid.columns.to_numpy()
+        months = intensity_grid.index.to_numpy()
         
         X, Y = np.meshgrid(years, months)
-        Z = np.zeros_like(X, dtype=float)
-        
-        for _, row in monthly_stats.iterrows():
-            year_idx = years.index(row['year'])
-            month_idx = months.index(row['month'])
-            Z[month_idx, year_idx] = row['intensity']
+        Z = intensity_grid.to_numpy(dtype=float)
         
         fig = plt.figure(figsize=(16, 12))
         ax = fig.add_subplot(111, projection='3d')
@@ -390,23 +556,17 @@ class HongKongSunsetClouds:
         ax.view_init(elev=30, azim=45)
         
         plt.tight_layout()
-        plt.savefig('/Users/cenyoushan/Desktop/programming 课的文件包/火烧云/3d_landscape.png', 
-                   dpi=300, bbox_inches='tight')
-        plt.show()
+        plt.savefig(OUT_DIR / '3d_landscape.png',
+                   dpi=self.dpi)
+        self._finish_figure(fig)
         
     def create_interactive_dashboard(self):
         """创建交互式仪表板"""
         print("🎨 创建交互式仪表板...")
         
-        # 准备数据
-        monthly_data = self.data.groupby(['year', 'month']).agg({
-            'has_sunset_clouds': 'sum',
-            'intensity': 'mean',
-            'duration_minutes': 'mean',
-            'coverage_percent': 'mean'
-        }).reset_index()
-        
-        monthly_data['date'] = pd.to_datetime(monthly_data[['year', 'month']].assign(day=1))
+        # 准备数据（复制缓存的月度统计，避免修改缓存）
+        monthly_data = self.monthly_stats.assign(
+            date=pd.to_datetime(self.monthly_stats[['year', 'month']].assign(day=1)))
         
         # 创建子图
         fig = make_subplots(
@@ -474,59 +634,47 @@ class HongKongSunsetClouds:
         )
         
         # 保存HTML文件
-        fig.write_html('/Users/cenyoushan/Desktop/programming 课的文件包/火烧云/interactive_dashboard.html')
+        fig.write_html(OUT_DIR / 'interactive_dashboard.html')
         print("💾 交互式仪表板已保存为 interactive_dashboard.html")
         
     def create_sunset_mandala(self):
         """创建火烧云曼陀罗图案"""
         print("🎨 创建火烧云曼陀罗艺术图...")
         
-        # 选择2020年数据
-        year_data = self.data[self.data['year'] == 2020].copy()
-        
         fig, ax = plt.subplots(figsize=(16, 16), subplot_kw=dict(projection='polar'))
         
-        # 创建多层曼陀罗
-        for layer in range(5):
-            radius_base = 0.2 + layer * 0.15
-            
-            for _, row in year_data.iterrows():
-                if row['has_sunset_clouds']:
-                    # 计算角度和半径
-                    angle = 2 * np.pi * row['day_of_year'] / 365
-                    intensity_factor = row['intensity'] / 10
-                    
-                    # 每层有不同的图案
-                    if layer == 0:  # 内圈 - 小点
-                        radius = radius_base + intensity_factor * 0.1
-                        size = 20 + row['intensity'] * 10
-                        ax.scatter(angle, radius, s=size, c=row['intensity'], 
-                                 cmap='Reds', alpha=0.8, edgecolors='gold', linewidth=0.5)
-                    
-                    elif layer == 1:  # 第二圈 - 花瓣形状
-                        for petal in range(6):
-                            petal_angle = angle + petal * np.pi / 3
-                            radius = radius_base + intensity_factor * 0.08
-                            ax.scatter(petal_angle, radius, s=30, c=row['intensity'], 
-                                     cmap='Oranges', alpha=0.6, marker='^')
-                    
-                    elif layer == 2:  # 第三圈 - 星形
-                        radius = radius_base + intensity_factor * 0.12
-                        ax.scatter(angle, radius, s=50, c=row['intensity'], 
-                                 cmap='YlOrRd', alpha=0.7, marker='*')
-                    
-                    elif layer == 3:  # 第四圈 - 方形
-                        radius = radius_base + intensity_factor * 0.1
-                        ax.scatter(angle, radius, s=40, c=row['intensity'], 
-                                 cmap='plasma', alpha=0.6, marker='s')
-                    
-                    else:  # 外圈 - 光芒效果
-                        for ray in range(8):
-                            ray_angle = angle + ray * np.pi / 4
-                            radius = radius_base + intensity_factor * 0.15
-                            ax.plot([ray_angle, ray_angle], [radius-0.05, radius+0.05], 
-                                   color=plt.cm.Spectral(intensity_factor), 
-                                   alpha=0.4, linewidth=2)
+        # 选择2020年的火烧云日，计算角度和强度
+        cloud_data = self.cloud_data[self.cloud_data['year'] == 2020]
+        intensity = cloud_data['intensity'].to_numpy()
+        angle = 2 * np.pi * cloud_data['day_of_year'].to_numpy() / 365
+        intensity_factor = intensity / 10
+        
+        # 第一层：内圈 - 小点（颜色一次性查表得到 RGBA 数组）
+        ax.scatter(angle, 0.2 + intensity_factor * 0.1, s=20 + intensity * 10,
+                   c=plt.cm.Reds(intensity_factor), alpha=0.8,
+                   edgecolors='gold', linewidth=0.5)
+        
+        # 第二层：花瓣形状（每天6片花瓣）
+        petal_angles = (angle[:, None] + np.arange(6) * np.pi / 3).ravel()
+        petal_radius = np.repeat(0.35 + intensity_factor * 0.08, 6)
+        ax.scatter(petal_angles, petal_radius, s=30,
+                   c=np.repeat(plt.cm.Oranges(intensity_factor), 6, axis=0),
+                   alpha=0.6, marker='^')
+        
+        # 第三层：星形
+        ax.scatter(angle, 0.5 + intensity_factor * 0.12, s=50,
+                   c=plt.cm.YlOrRd(intensity_factor), alpha=0.7, marker='*')
+        
+        # 第四层：方形
+        ax.scatter(angle, 0.65 + intensity_factor * 0.1, s=40,
+                   c=plt.cm.plasma(intensity_factor), alpha=0.6, marker='s')
+        
+        # 外圈：光芒效果（每天8道径向光芒）
+        ray_angles = (angle[:, None] + np.arange(8) * np.pi / 4).ravel()
+        ray_radius = np.repeat(0.8 + intensity_factor * 0.15, 8)
+        ray_colors = np.repeat(plt.cm.Spectral(intensity_factor), 8, axis=0)
+        ax.vlines(ray_angles, ray_radius - 0.05, ray_radius + 0.05,
+                  colors=ray_colors, alpha=0.4, linewidth=2)
         
         # 添加月份标记
         month_angles = np.linspace(0, 2 * np.pi, 12, endpoint=False)
@@ -547,9 +695,9 @@ class HongKongSunsetClouds:
         
         fig.patch.set_facecolor('black')
         plt.tight_layout()
-        plt.savefig('/Users/cenyoushan/Desktop/programming 课的文件包/火烧云/sunset_mandala.png', 
-                   dpi=300, bbox_inches='tight', facecolor='black')
-        plt.show()
+        plt.savefig(OUT_DIR / 'sunset_mandala.png',
+                   dpi=self.dpi, facecolor='black')
+        self._finish_figure(fig)
     
     def create_flowing_river_chart(self):
         """创建流动河流图"""
@@ -557,11 +705,12 @@ class HongKongSunsetClouds:
         
         fig, ax = plt.subplots(figsize=(20, 12))
         
-        # 准备数据
-        monthly_data = self.data.groupby(['year', 'month']).agg({
-            'intensity': 'mean',
-            'has_sunset_clouds': 'sum'
-        }).reset_index()
+        # 一次性取出各列数组，按月份用布尔掩码切片
+        monthly_data = self.monthly_stats
+        stat_months = monthly_data['month'].to_numpy()
+        stat_years = monthly_data['year'].to_numpy()
+        stat_intensity = monthly_data['intensity'].to_numpy()
+        stat_counts = monthly_data['has_sunset_clouds'].to_numpy()
         
         # 创建流动效果
         years = range(2000, 2021)
@@ -569,33 +718,33 @@ class HongKongSunsetClouds:
         
         # 为每个月创建一条"河流"
         for month in months:
-            month_data = monthly_data[monthly_data['month'] == month]
+            in_month = stat_months == month
             
-            if len(month_data) > 0:
-                x = month_data['year']
-                y = month_data['intensity'] + month * 0.8  # 垂直偏移
-                width = month_data['has_sunset_clouds'] / 10  # 河流宽度
+            if in_month.any():
+                x = stat_years[in_month]
+                intensity = stat_intensity[in_month]
+                y = intensity + month * 0.8  # 垂直偏移
+                width = stat_counts[in_month] / 10  # 河流宽度
+                
+                # 创建平滑的河流路径（每段50个插值点）
+                x_smooth = np.linspace(x.min(), x.max(), 50 * len(x))
+                y_smooth = np.interp(x_smooth, x, y)
+                width_smooth = np.interp(x_smooth, x, width)
                 
-                # 创建河流路径
-                for i in range(len(x)-1):
-                    # 创建贝塞尔曲线效果
-                    x_smooth = np.linspace(x.iloc[i], x.iloc[i+1], 50)
-                    y_smooth = np.interp(x_smooth, x, y)
-                    
-                    # 添加随机波动
-                    y_smooth += np.sin(x_smooth * 2) * 0.1 * month_data['intensity'].iloc[i]
-                    
-                    # 绘制河流
-                    colors = plt.cm.Spectral_r(month / 12)
-                    ax.fill_between(x_smooth, 
-                                   y_smooth - width.iloc[i]/2, 
-                                   y_smooth + width.iloc[i]/2,
-                                   alpha=0.6, color=colors)
-                    
-                    # 添加亮点
-                    if month_data['intensity'].iloc[i] > 6:
-                        ax.scatter(x.iloc[i], y.iloc[i], s=100, 
-                                 color='gold', alpha=0.8, zorder=10)
+                # 添加随机波动
+                y_smooth += np.sin(x_smooth * 2) * 0.1 * np.interp(x_smooth, x, intensity)
+                
+                # 绘制河流
+                colors = plt.cm.Spectral_r(month / 12)
+                ax.fill_between(x_smooth,
+                               y_smooth - width_smooth / 2,
+                               y_smooth + width_smooth / 2,
+                               alpha=0.6, color=colors)
+                
+                # 添加亮点
+                bright = intensity > 6
+                ax.scatter(x[bright], y[bright], s=100,
+                         color='gold', alpha=0.8, zorder=10)
         
         # 添加月份标签
         month_names = ['1月', '2月', '3月', '4月', '5月', '6月',
@@ -621,9 +770,9 @@ class HongKongSunsetClouds:
         ax.spines['right'].set_visible(False)
         
         plt.tight_layout()
-        plt.savefig('/Users/cenyoushan/Desktop/programming 课的文件包/火烧云/flowing_river.png', 
-                   dpi=300, bbox_inches='tight', facecolor='black')
-        plt.show()
+        plt.savefig(OUT_DIR / 'flowing_river.png',
+                   dpi=self.dpi, facecolor='black')
+        self._finish_figure(fig)
     
     def create_constellation_map(self):
         """创建火烧云星座图"""
@@ -631,41 +780,44 @@ class HongKongSunsetClouds:
         
         fig, ax = plt.subplots(figsize=(18, 18))
         
-        # 使用2015年数据作为星座
-        year_data = self.data[self.data['year'] == 2015].copy()
-        cloud_data = year_data[year_data['has_sunset_clouds']].copy()
+        # 使用2015年火烧云日作为星座
+        cloud_data = self.cloud_data[self.cloud_data['year'] == 2015]
         
         # 创建"星座"连接
         cloud_data = cloud_data.sort_values('day_of_year')
+        day_of_year = cloud_data['day_of_year'].to_numpy()
+        intensity = cloud_data['intensity'].to_numpy()
         
-        # 转换为极坐标
-        angles = 2 * np.pi * cloud_data['day_of_year'] / 365
-        radii = 5 + cloud_data['intensity'] * 2
+        # 转换为极坐标（角度 2π·day/365，直接查三角函数表）
+        cos_day, sin_day = _trig_table(365)
+        day_idx = day_of_year % 365
+        radii = 5 + intensity * 2
         
         # 转换为笛卡尔坐标
-        x = radii * np.cos(angles)
-        y = radii * np.sin(angles)
-        
-        # 绘制"星星"
-        for i, (xi, yi, intensity) in enumerate(zip(x, y, cloud_data['intensity'])):
-            # 主星
-            star_size = 50 + intensity * 20
-            ax.scatter(xi, yi, s=star_size, c=intensity, cmap='Reds', 
-                      alpha=0.8, edgecolors='gold', linewidth=1)
-            
-            # 光芒效果
-            for angle in np.linspace(0, 2*np.pi, 8):
-                ray_length = intensity / 5
-                ray_x = xi + ray_length * np.cos(angle)
-                ray_y = yi + ray_length * np.sin(angle)
-                ax.plot([xi, ray_x], [yi, ray_y], 
-                       color='gold', alpha=0.3, linewidth=1)
-        
-        # 连接相邻的"星星"形成星座
-        for i in range(len(x)-1):
-            if i % 3 == 0:  # 每3个点连一次线，形成星座图案
-                ax.plot([x.iloc[i], x.iloc[i+1]], [y.iloc[i], y.iloc[i+1]], 
-                       color='cyan', alpha=0.4, linewidth=0.8, linestyle='--')
+        x = radii * cos_day[day_idx]
+        y = radii * sin_day[day_idx]
+        
+        # 绘制"星星"（一次 scatter 画出所有主星）
+        ax.scatter(x, y, s=50 + intensity * 20, c=plt.cm.Reds(intensity / 10),
+                  alpha=0.8, edgecolors='gold', linewidth=1)
+        
+        # 光芒效果：每颗星 8 条光芒，合并为一个 LineCollection
+        ray_cos, ray_sin = _trig_table(8)
+        ray_length = (intensity / 5)[:, None]
+        x0 = np.repeat(x[:, None], 8, axis=1)
+        y0 = np.repeat(y[:, None], 8, axis=1)
+        ray_starts = np.stack([x0, y0], axis=-1).reshape(-1, 2)
+        ray_ends = np.stack([x0 + ray_length * ray_cos,
+                             y0 + ray_length * ray_sin], axis=-1).reshape(-1, 2)
+        ax.add_collection(LineCollection(np.stack([ray_starts, ray_ends], axis=1),
+                                         colors='gold', alpha=0.3, linewidths=1))
+        
+        # 连接相邻的"星星"形成星座：每3个点连一次线，形成星座图案
+        points = np.column_stack([x, y])
+        link_starts = np.arange(0, len(points) - 1, 3)
+        ax.add_collection(LineCollection(
+            np.stack([points[link_starts], points[link_starts + 1]], axis=1),
+            colors='cyan', alpha=0.4, linewidths=0.8, linestyles='--'))
         
         # 添加同心圆
         circles = [5, 10, 15, 20]
@@ -675,13 +827,13 @@ class HongKongSunsetClouds:
             ax.add_patch(circle)
         
         # 添加月份方向标记
-        month_angles = np.linspace(0, 2 * np.pi, 12, endpoint=False)
+        month_cos, month_sin = _trig_table(12)
         month_names = ['1月', '2月', '3月', '4月', '5月', '6月',
                       '7月', '8月', '9月', '10月', '11月', '12月']
         
-        for angle, month in zip(month_angles, month_names):
-            x_label = 22 * np.cos(angle)
-            y_label = 22 * np.sin(angle)
+        for cos_a, sin_a, month in zip(month_cos, month_sin, month_names):
+            x_label = 22 * cos_a
+            y_label = 22 * sin_a
             ax.text(x_label, y_label, month, ha='center', va='center',
                    fontsize=10, color='white', fontweight='bold')
             
@@ -700,9 +852,9 @@ class HongKongSunsetClouds:
                     fontsize=16, color='white', fontweight='bold', pad=20)
         
         plt.tight_layout()
-        plt.savefig('/Users/cenyoushan/Desktop/programming 课的文件包/火烧云/constellation_map.png', 
-                   dpi=300, bbox_inches='tight', facecolor='black')
-        plt.show()
+        plt.savefig(OUT_DIR / 'constellation_map.png',
+                   dpi=self.dpi, facecolor='black')
+        self._finish_figure(fig)
     
     def create_musical_score(self):
         """创建火烧云音乐乐谱图"""
@@ -710,54 +862,42 @@ class HongKongSunsetClouds:
         
         fig, ax = plt.subplots(figsize=(24, 8))
         
-        # 使用2010年数据
-        year_data = self.data[self.data['year'] == 2010].copy()
-        
         # 创建五线谱
         staff_lines = [1, 2, 3, 4, 5]
         for line in staff_lines:
             ax.axhline(y=line, color='black', linewidth=1, alpha=0.6)
         
-        # 将强度映射到音符位置
-        for _, row in year_data.iterrows():
-            if row['has_sunset_clouds']:
-                x_pos = row['day_of_year']
-                
-                # 根据强度确定音符位置（1-5线）
-                note_position = 1 + (row['intensity'] / 10) * 4
-                
-                # 根据强度选择音符类型和颜色
-                if row['intensity'] <= 3:
-                    marker = 'o'
-                    color = '#FFD700'
-                    size = 100
-                elif row['intensity'] <= 6:
-                    marker = 'o'
-                    color = '#FF6B35'
-                    size = 150
-                else:
-                    marker = 'o'
-                    color = '#C1272D'
-                    size = 200
-                
-                # 绘制音符
-                ax.scatter(x_pos, note_position, s=size, c=color, 
-                          marker=marker, alpha=0.8, edgecolors='black', linewidth=1)
-                
-                # 添加音符尾巴（强度高的音符）
-                if row['intensity'] > 7:
-                    ax.plot([x_pos, x_pos], [note_position, note_position + 0.8], 
-                           color='black', linewidth=2)
-                    
-                    # 添加音符旗帜
-                    flag_x = [x_pos, x_pos + 10, x_pos + 8, x_pos]
-                    flag_y = [note_position + 0.8, note_position + 0.9, 
-                             note_position + 0.6, note_position + 0.8]
-                    ax.fill(flag_x, flag_y, color=color, alpha=0.7)
+        # 将2010年火烧云日的强度映射到音符位置（1-5线）
+        cloud_data = self.cloud_data[self.cloud_data['year'] == 2010]
+        x_pos = cloud_data['day_of_year'].to_numpy()
+        intensity = cloud_data['intensity'].to_numpy()
+        note_position = 1 + (intensity / 10) * 4
+        
+        # 根据强度选择音符颜色和大小，每档一次绘制
+        note_styles = [
+            (intensity <= 3, '#FFD700', 100),
+            ((intensity > 3) & (intensity <= 6), '#FF6B35', 150),
+            (intensity > 6, '#C1272D', 200),
+        ]
+        for mask, color, size in note_styles:
+            ax.scatter(x_pos[mask], note_position[mask], s=size, c=color,
+                      marker='o', alpha=0.8, edgecolors='black', linewidth=1)
+        
+        # 添加音符尾巴和旗帜（强度高的音符）
+        tails = intensity > 7
+        tail_x = x_pos[tails]
+        tail_top = note_position[tails] + 0.8
+        ax.vlines(tail_x, note_position[tails], tail_top, color='black', linewidth=2)
+        flags = np.stack([
+            np.column_stack([tail_x, tail_top]),
+            np.column_stack([tail_x + 10, tail_top + 0.1]),
+            np.column_stack([tail_x + 8, tail_top - 0.2]),
+        ], axis=1)
+        ax.add_collection(PolyCollection(flags, color='#C1272D', alpha=0.7))
         
         # 添加月份分割线（小节线）
-        for month in range(1, 13):
-            day_of_year = pd.Timestamp(f'2010-{month:02d}-01').timetuple().tm_yday
+        month_starts = pd.date_range('2010-01-01', periods=12, freq='MS').dayofyear.values
+        for month, day_of_year in enumerate(month_starts, 1):
             ax.axvline(x=day_of_year, color='black', linewidth=2, alpha=0.8)
             
             # 月份标记
@@ -792,9 +932,9 @@ class HongKongSunsetClouds:
                  title='火烧云强度', title_fontsize=12)
         
         plt.tight_layout()
-        plt.savefig('/Users/cenyoushan/Desktop/programming 课的文件包/火烧云/musical_score.png', 
-                   dpi=300, bbox_inches='tight')
-        plt.show()
+        plt.savefig(OUT_DIR / 'musical_score.png',
+                   dpi=self.dpi)
+        self._finish_figure(fig)
     
     def create_flower_bloom_animation(self):
         """创建花朵绽放动画式静态图"""
@@ -805,130 +945,196 @@ class HongKongSunsetClouds:
                     fontsize=16, fontweight='bold')
         
         seasons = {
-            '春季 Spring': {'months': [3, 4, 5], 'color': '#90EE90', 'ax': axes[0,0]},
-            '夏季 Summer': {'months': [6, 7, 8], 'color': '#FFD700', 'ax': axes[0,1]},
-            '秋季 Autumn': {'months': [9, 10, 11], 'color': '#FF6347', 'ax': axes[1,0]},
-            '冬季 Winter': {'months': [12, 1, 2], 'color': '#87CEEB', 'ax': axes[1,1]}
+            '春季 Spring': {'season': 'spring', 'color': '#90EE90', 'ax': axes[0,0]},
+            '夏季 Summer': {'season': 'summer', 'color': '#FFD700', 'ax': axes[0,1]},
+            '秋季 Autumn': {'season': 'autumn', 'color': '#FF6347', 'ax': axes[1,0]},
+            '冬季 Winter': {'season': 'winter', 'color': '#87CEEB', 'ax': axes[1,1]}
         }
         
+        # 四个子图的坐标设置相同，统一设置一次
+        for ax in axes.flat:
+            ax.set(xlim=(-8, 8), ylim=(-8, 8), aspect='equal')
+            ax.grid(True, alpha=0.3)
+        
         for season_name, season_info in seasons.items():
             ax = season_info['ax']
             
-            # 获取季节数据
-            season_data = self.data[self.data['month'].isin(season_info['months'])]
-            cloud_data = season_data[season_data['has_sunset_clouds']]
+            # 获取季节数据（来自缓存的季节分组）
+            cloud_data = self.seasonal_cloud_data.get(season_info['season'])
             
-            if len(cloud_data) > 0:
+            if cloud_data is not None:
                 # 创建花朵中心
                 ax.scatter(0, 0, s=500, c='gold', marker='*', 
                           edgecolors='orange', linewidth=2, zorder=10)
                 
-                # 根据数据创建花瓣
-                for i, (_, row) in enumerate(cloud_data.iterrows()):
-                    angle = 2 * np.pi * i / len(cloud_data)
-                    radius = row['intensity'] / 2
-                    
-                    # 花瓣位置
-                    x = radius * np.cos(angle)
-                    y = radius * np.sin(angle)
-                    
-                    # 花瓣大小和颜色
-                    petal_size = 100 + row['intensity'] * 30
-                    intensity_color = plt.cm.Reds(row['intensity'] / 10)
-                    
-                    # 绘制花瓣
-                    ax.scatter(x, y, s=petal_size, c=[intensity_color], 
-                              marker='o', alpha=0.7, edgecolors='darkred', linewidth=1)
-                    
-                    # 连接线（花茎）
-                    ax.plot([0, x], [0, y], color=season_info['color'], 
-                           alpha=0.5, linewidth=2)
+                # 根据数据创建花瓣：按出现顺序均匀分布在一圈上
+                intensity = cloud_data['intensity'].to_numpy()
+                n = len(intensity)
+                angles = 2 * np.pi * np.arange(n) / n
+                radius = intensity / 2
+                
+                # 花瓣位置（花瓣数随季节变化，直接计算，不走 _trig_table 缓存）
+                x = radius * np.cos(angles)
+                y = radius * np.sin(angles)
+                
+                # 绘制花瓣（大小和颜色随强度变化）
+                ax.scatter(x, y, s=100 + intensity * 30, c=plt.cm.Reds(intensity / 10),
+                          marker='o', alpha=0.7, edgecolors='darkred', linewidth=1)
                 
-                # 添加装饰圆圈
-                for radius in [2, 4, 6]:
-                    circle = Circle((0, 0), radius, fill=False, 
-                                  color=season_info['color'], alpha=0.3, linewidth=1)
-                    ax.add_patch(circle)
+                # 连接线（花茎），合并为一个 LineCollection
+                stems = np.stack([np.zeros((n, 2)), np.column_stack([x, y])], axis=1)
+                ax.add_collection(LineCollection(stems, colors=season_info['color'],
+                                                 alpha=0.5, linewidths=2))
+                
+                # 添加装饰圆圈（三个同心圆合并为一个 PatchCollection）
+                ax.add_collection(PatchCollection(
+                    [Circle((0, 0), r) for r in (2, 4, 6)], facecolors='none',
+                    edgecolors=season_info['color'], alpha=0.3, linewidths=1))
             
-            ax.set_xlim(-8, 8)
-            ax.set_ylim(-8, 8)
-            ax.set_aspect('equal')
             ax.set_title(season_name, fontsize=14, fontweight='bold')
-            ax.grid(True, alpha=0.3)
         
         plt.tight_layout()
-        plt.savefig('/Users/cenyoushan/Desktop/programming 课的文件包/火烧云/flower_bloom.png', 
-                   dpi=300, bbox_inches='tight')
-        plt.show()
+        plt.savefig(OUT_DIR / 'flower_bloom.png',
+                   dpi=self.dpi)
+        self._finish_figure(fig)
         
     def generate_summary_report(self):
         """生成数据分析报告"""
         print("📊 生成数据分析报告...")
         
-        total_days = len(self.data)
-        cloud_days = self.data['has_sunset_clouds'].sum()
+        total_days = len(self.cloud_mask)
+        cloud_days = len(self.cloud_data)
         cloud_percentage = (cloud_days / total_days) * 100
         
+        # 由缓存的年×月统计再汇总到年、月两个维度
+        sum_cols = ['has_sunset_clouds', 'intensity_sum', 'duration_sum', 'days']
+        by_year = self.monthly_stats.groupby('year')[sum_cols].sum()
+        by_month = self.monthly_stats.groupby('month')[sum_cols].sum()
+        
         # 按年统计
-        yearly_stats = self.data.groupby('year').agg({
-            'has_sunset_clouds': 'sum',
-            'intensity': 'mean',
-            'duration_minutes': 'mean'
+        yearly_summary = pd.DataFrame({
+            'has_sunset_clouds': by_year['has_sunset_clouds'],
+            'intensity': by_year['intensity_sum'] / by_year['days'],
+            'duration_minutes': by_year['duration_sum'] / by_year['days']
         }).round(2)
         
         # 按月统计
-        monthly_stats = self.data.groupby('month').agg({
-            'has_sunset_clouds': 'sum',
-            'intensity': 'mean'
+        monthly_summary = pd.DataFrame({
+            'has_sunset_clouds': by_month['has_sunset_clouds'],
+            'intensity': by_month['intensity_sum'] / by_month['days']
         }).round(2)
         
-        print("\n" + "="*60)
-        print("🌅 香港火烧云真实数据分析报告 (2000-2020)")
-        print("="*60)
-        print(f"📊 总体统计:")
-        print(f"   • 总观测天数: {total_days:,} 天")
-        print(f"   • 火烧云出现天数: {cloud_days:,} 天")
-        print(f"   • 出现概率: {cloud_percentage:.1f}%")
+        # 每个数值只取一次，汇总后填入报告模板
+        year_counts = yearly_summary['has_sunset_clouds'].to_numpy()
+        month_counts = monthly_summary['has_sunset_clouds'].to_numpy()
+        best_y, worst_y = year_counts.argmax(), year_counts.argmin()
+        best_m, worst_m = month_counts.argmax(), month_counts.argmin()
         
+        cloud_means = ''
         if cloud_days > 0:
-            print(f"   • 平均强度: {self.data[self.data['has_sunset_clouds']]['intensity'].mean():.2f}/10")
-            print(f"   • 平均持续时间: {self.data[self.data['has_sunset_clouds']]['duration_minutes'].mean():.1f} 分钟")
-        
-        print(f"\n📈 年度趋势:")
-        best_year = yearly_stats['has_sunset_clouds'].idxmax()
-        worst_year = yearly_stats['has_sunset_clouds'].idxmin()
-        print(f"   • 最佳年份: {best_year} ({yearly_stats.loc[best_year, 'has_sunset_clouds']} 次)")
-        print(f"   • 最少年份: {worst_year} ({yearly_stats.loc[worst_year, 'has_sunset_clouds']} 次)")
-        
-        print(f"\n🗓️  季节性分布:")
-        best_month = monthly_stats['has_sunset_clouds'].idxmax()
-        worst_month = monthly_stats['has_sunset_clouds'].idxmin()
-        print(f"   • 最佳月份: {best_month}月 ({monthly_stats.loc[best_month, 'has_sunset_clouds']} 次)")
-        print(f"   • 最少月份: {worst_month}月 ({monthly_stats.loc[worst_month, 'has_sunset_clouds']} 次)")
-        
-        print("\n🏢 数据来源特点:")
-        print("   • 基于香港天文台140多年历史观测数据")
-        print("   • 考虑季风、厄尔尼诺等气候因子影响")
-        print("   • 融入城市化和空气质量变化趋势")
-        print("   • 符合亚热带海洋性气候特征")
-        
-        print("\n🎨 已生成可视化图表:")
-        print("   • annual_heatmap.png - 年度强度热力图")
-        print("   • circular_calendar.png - 圆形日历可视化") 
-        print("   • 3d_landscape.png - 3D时间景观图")
-        print("   • sunset_art.png - 艺术风格日落图")
-        print("   • interactive_dashboard.html - 交互式仪表板")
-        print("="*60)
-        
-        return yearly_stats, monthly_stats
+            cloud_means = REPORT_MEANS_TEMPLATE.format_map({
+                'mean_intensity': self.cloud_data['intensity'].to_numpy().mean(),
+                'mean_duration': self.cloud_data['duration_minutes'].to_numpy().mean(),
+            })
+        
+        stats = {
+            'total_days': total_days,
+            'cloud_days': cloud_days,
+            'cloud_percentage': cloud_percentage,
+            'cloud_means': cloud_means,
+            'best_year': yearly_summary.index[best_y],
+            'best_year_count': year_counts[best_y],
+            'worst_year': yearly_summary.index[worst_y],
+            'worst_year_count': year_counts[worst_y],
+            'best_month': monthly_summary.index[best_m],
+            'best_month_count': month_counts[best_m],
+            'worst_month': monthly_summary.index[worst_m],
+            'worst_month_count': month_counts[worst_m],
+        }
+        print(REPORT_TEMPLATE.format_map(stats))
+        
+        return yearly_summary, monthly_summary
+
+# 可通过 --viz 选择的图表（名称 → 方法名）
+VISUALIZATIONS = {
+    'heatmap': 'create_annual_heatmap',
+    'calendar': 'create_circular_calendar',
+    '3d': 'create_3d_landscape',
+    'dashboard': 'create_interactive_dashboard',
+    'mandala': 'create_sunset_mandala',
+    'river': 'create_flowing_river_chart',
+    'constellation': 'create_constellation_map',
+    'musical': 'create_musical_score',
+    'flower': 'create_flower_bloom_animation',
+}
+ART_VISUALIZATIONS = ('mandala', 'river', 'constellation', 'musical', 'flower')
+
+# 并行渲染时每个工作进程持有的分析器
+_worker_analyzer = None
 
-def main():
+def _init_worker(data, dpi):
+    """工作进程初始化：使用无界面后端，并接收一次数据"""
+    global _worker_analyzer
+    matplotlib.use('Agg')
+    _worker_analyzer = HongKongSunsetClouds(dpi=dpi)
+    _worker_analyzer.data = data
+
+def _render_visualization(name):
+    """在工作进程中生成一个图表，返回其打印输出（由主进程按顺序输出，避免各进程输出交错）"""
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        getattr(_worker_analyzer, VISUALIZATIONS[name])()
+    return buffer.getvalue()
+
+def _parse_viz(value):
+    """解析 --viz 参数：逗号分隔的图表名称，或 all / none"""
+    if value == 'all':
+        return list(VISUALIZATIONS)
+    if value == 'none':
+        return []
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in names if name not in VISUALIZATIONS]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"未知图表: {', '.join(unknown)}（可选: {', '.join(VISUALIZATIONS)}）")
+    return names
+
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description='香港火烧云数据可视化 (2000-2020)')
+    parser.add_argument('--viz', type=_parse_viz, default='all',
+                        help='要生成的图表，逗号分隔，如 mandala,river；'
+                             'all 为全部（默认），none 只输出报告。'
+                             f"可选: {', '.join(VISUALIZATIONS)}")
+    parser.add_argument('--show', action='store_true',
+                        help='保存后弹出窗口显示图表（默认只写文件）')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='并行渲染图表的进程数（默认 1，即依次生成）')
+    parser.add_argument('--dpi', type=int, default=150,
+                        help='图片分辨率（默认 150，出版级输出可用 300）')
+    return parser.parse_args(argv)
+
+def _has_display():
+    """Linux 下没有 X11/Wayland 显示时无法弹出窗口"""
+    if not sys.platform.startswith('linux'):
+        return True
+    return bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+
+def main(argv=None):
     """主函数"""
+    args = parse_args(argv)
+    if args.show and not _has_display():
+        print("⚠️ 未检测到图形界面，忽略 --show，只保存文件")
+        args.show = False
+    if not args.show:
+        matplotlib.use('Agg')  # 无界面后端：直接写文件，不弹出窗口
+    OUT_DIR.mkdir(parents=True, exist_ok=True)
+    
     print("🌅 香港火烧云真实数据可视化项目启动")
     print("="*50)
     
     # 创建分析器实例
-    analyzer = HongKongSunsetClouds()
+    analyzer = HongKongSunsetClouds(dpi=args.dpi, show=args.show)
     
     # 获取真实数据
     try:
@@ -937,19 +1143,30 @@ def main():
         print("⚠️ 使用基于真实气象模式的数据...")
         data = analyzer.generate_realistic_data()
     
-    # 创建传统可视化
-    analyzer.create_annual_heatmap()
-    analyzer.create_circular_calendar()
-    analyzer.create_3d_landscape()
-    analyzer.create_interactive_dashboard()
+    traditional = [name for name in args.viz if name not in ART_VISUALIZATIONS]
+    art = [name for name in args.viz if name in ART_VISUALIZATIONS]
     
-    # 创建创意艺术可视化
-    print("\n🎨 开始创建创意艺术可视化...")
-    analyzer.create_sunset_mandala()
-    analyzer.create_flowing_river_chart()
-    analyzer.create_constellation_map()
-    analyzer.create_musical_score()
-    analyzer.create_flower_bloom_animation()
+    if args.jobs > 1 and args.viz and not args.show:
+        # 各图表互不依赖，分发到多个进程并行渲染（数据在每个进程初始化时传入一次）
+        print(f"🚀 使用 {args.jobs} 个进程并行生成 {len(args.viz)} 个图表...")
+        with ProcessPoolExecutor(max_workers=args.jobs, initializer=_init_worker,
+                                 initargs=(analyzer.data, analyzer.dpi)) as executor:
+            outputs = executor.map(_render_visualization, traditional + art)
+            # 按提交顺序输出，与依次生成时的输出一致
+            for i, output in enumerate(outputs):
+                if art and i == len(traditional):
+                    print("\n🎨 开始创建创意艺术可视化...")
+                print(output, end='')
+    else:
+        # 创建传统可视化
+        for name in traditional:
+            getattr(analyzer, VISUALIZATIONS[name])()
+        
+        # 创建创意艺术可视化
+        if art:
+            print("\n🎨 开始创建创意艺术可视化...")
+        for name in art:
+            getattr(analyzer, VISUALIZATIONS[name])()
     
     # 生成报告
     yearly_stats, monthly_stats = analyzer.generate_summary_report()